@@ -0,0 +1,104 @@
+//! Times the writing and reading of a table held in memory
+//!
+//! Usage: cargo run --release --example benchmark [num_records]
+#[macro_use]
+extern crate dbase;
+
+use std::convert::TryFrom;
+use std::io::Cursor;
+use std::time::{Duration, Instant};
+
+use dbase::{Date, FieldName, Reader, TableWriterBuilder};
+
+dbase_record!(
+    #[derive(Debug)]
+    struct Person {
+        name: String,
+        title: String,
+        age: i32,
+        salary: f64,
+        birth_date: Date,
+        active: bool,
+    }
+);
+
+fn generate_persons(count: usize) -> Vec<Person> {
+    (0..count)
+        .map(|i| Person {
+            name: format!("Person_{:05}", i),
+            title: format!("Title_{}", i % 10),
+            age: 18 + (i % 53) as i32,
+            salary: 3000.0 + ((i * 37) % 47_000) as f64 + 0.25,
+            birth_date: Date::new(
+                1 + (i % 28) as u32,
+                1 + (i % 12) as u32,
+                1960 + (i % 40) as u32,
+            ),
+            active: i % 2 == 0,
+        })
+        .collect()
+}
+
+fn report(step: &str, count: usize, elapsed: Duration) {
+    let seconds = elapsed.as_secs_f64();
+    println!(
+        "{:<16} {:>10.3} ms {:>14.0} records/s",
+        step,
+        seconds * 1000.0,
+        count as f64 / seconds
+    );
+}
+
+fn main() {
+    let count = std::env::args()
+        .nth(1)
+        .map(|arg| {
+            arg.parse::<usize>()
+                .expect("num_records must be an integer")
+        })
+        .unwrap_or(100_000);
+    let persons = generate_persons(count);
+
+    let mut cursor = Cursor::new(Vec::<u8>::new());
+    let start = Instant::now();
+    TableWriterBuilder::new()
+        .add_character_field(FieldName::try_from("name").unwrap(), 50)
+        .add_character_field(FieldName::try_from("title").unwrap(), 20)
+        .add_integer_field(FieldName::try_from("age").unwrap())
+        .add_numeric_field(FieldName::try_from("salary").unwrap(), 12, 2)
+        .add_date_field(FieldName::try_from("birth_date").unwrap())
+        .add_logical_field(FieldName::try_from("active").unwrap())
+        .build_with_dest(&mut cursor)
+        .write_records(&persons)
+        .unwrap();
+    report("write", count, start.elapsed());
+    let bytes = cursor.into_inner();
+
+    let start = Instant::now();
+    let records = Reader::new(Cursor::new(bytes.as_slice()))
+        .unwrap()
+        .read()
+        .unwrap();
+    report("read", records.len(), start.elapsed());
+
+    let start = Instant::now();
+    let persons = Reader::new(Cursor::new(bytes.as_slice()))
+        .unwrap()
+        .read_as::<Person>()
+        .unwrap();
+    report("read_as", persons.len(), start.elapsed());
+
+    let start = Instant::now();
+    let columns = Reader::new(Cursor::new(bytes.as_slice()))
+        .unwrap()
+        .read_columns()
+        .unwrap();
+    report("read_columns", columns["name"].len(), start.elapsed());
+
+    let start = Instant::now();
+    let salaries = Reader::new(Cursor::new(bytes.as_slice()))
+        .unwrap()
+        .read_column("salary")
+        .unwrap();
+    report("read_column", salaries.len(), start.elapsed());
+}
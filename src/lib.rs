@@ -142,6 +142,7 @@
 //!
 //! stations[0].get_mut("line").and_then(|_old| Some("Red".to_string()));
 //! writer.write_records(&stations)?;
+//! # let ignored_result = std::fs::remove_file("stations.dbf");
 //! # Ok(())
 //! # }
 //! ```
@@ -221,6 +222,7 @@
 
 extern crate byteorder;
 extern crate chrono;
+extern crate itoa;
 #[cfg(feature = "serde")]
 extern crate serde;
 
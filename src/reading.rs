@@ -8,6 +8,7 @@ use std::convert::TryFrom;
 use std::fs::File;
 use std::io::{BufReader, Read, Seek, SeekFrom};
 use std::iter::FusedIterator;
+use std::ops::Range;
 use std::path::Path;
 
 use crate::error::{Error, ErrorKind, FieldIOError};
@@ -21,6 +22,9 @@ pub(crate) const TERMINATOR_VALUE: u8 = 0x0D;
 
 const BACKLINK_SIZE: u16 = 263;
 
+/// Minimum number of bytes of records read at once when reading all the records
+const RECORDS_BLOCK_SIZE: usize = 64 * 1024;
+
 /// Trait to be implemented by structs that represent records read from a
 /// dBase file.
 ///
@@ -48,7 +52,8 @@ impl ReadableRecord for Record {
     where
         T: Read + Seek,
     {
-        let mut map = HashMap::<String, FieldValue>::new();
+        let mut map =
+            HashMap::<String, FieldValue>::with_capacity(field_iterator.fields_info.len());
         for result in field_iterator {
             let NamedValue { name, value } = result?;
             map.insert(name.to_owned(), value);
@@ -147,6 +152,8 @@ pub struct Reader<T: Read + Seek> {
     memo_reader: Option<MemoReader<T>>,
     header: Header,
     fields_info: Vec<FieldInfo>,
+    /// Buffer holding the bytes of the record being read
+    record_data: Vec<u8>,
 }
 
 impl<T: Read + Seek> Reader<T> {
@@ -208,11 +215,17 @@ impl<T: Read + Seek> Reader<T> {
             .seek(SeekFrom::Start(u64::from(header.offset_to_first_record)))
             .map_err(|error| Error::io_error(error, 0))?;
 
+        let record_size = fields_info
+            .iter()
+            .map(|info| info.field_length as usize)
+            .sum();
+
         Ok(Self {
             source,
             memo_reader: None,
             header,
             fields_info,
+            record_data: vec![0u8; record_size],
         })
     }
 
@@ -242,9 +255,16 @@ impl<T: Read + Seek> Reader<T> {
 
     /// Reads all the records of the file inside a `Vec`
     pub fn read_as<R: ReadableRecord>(&mut self) -> Result<Vec<R>, Error> {
+        let capacity = self
+            .records_capacity()
+            .map_err(|error| Error::io_error(error, 0))?;
+        // Collecting into a Result would not use the size of the iterator
+        let mut records = Vec::<R>::with_capacity(capacity);
         // We don't read the file terminator
-        self.iter_records_as::<R>()
-            .collect::<Result<Vec<R>, Error>>()
+        for record in self.iter_records_as::<R>() {
+            records.push(record?);
+        }
+        Ok(records)
     }
 
     /// Make the `Reader` read the [Records](struct.Record.html)
@@ -261,8 +281,197 @@ impl<T: Read + Seek> Reader<T> {
     /// # }
     /// ```
     pub fn read(&mut self) -> Result<Vec<Record>, Error> {
-        // We don't read the file terminator
-        self.iter_records().collect::<Result<Vec<Record>, Error>>()
+        self.read_as::<Record>()
+    }
+
+    /// Reads all the records of the file, one `Vec` (column) per field
+    ///
+    /// The values of a field are stored in the order of the records.
+    /// Compared to [read](struct.Reader.html#method.read), this avoids
+    /// creating a map and copying the field names for each record.
+    ///
+    /// # Example
+    ///
+    /// ```
+    /// use dbase::FieldValue;
+    /// # fn main() -> Result<(), dbase::Error> {
+    /// let mut reader = dbase::Reader::from_path("tests/data/stations.dbf")?;
+    /// let columns = reader.read_columns()?;
+    /// assert_eq!(
+    ///     columns["name"][0],
+    ///     FieldValue::Character(Some("Van Dorn Street".to_owned()))
+    /// );
+    /// # Ok(())
+    /// # }
+    /// ```
+    pub fn read_columns(&mut self) -> Result<HashMap<String, Vec<FieldValue>>, Error> {
+        let capacity = self
+            .records_capacity()
+            .map_err(|error| Error::io_error(error, 0))?;
+        let record_size = self.record_data.len();
+        let fields = self.field_ranges();
+        let mut columns = fields
+            .iter()
+            .map(|_| Vec::<FieldValue>::with_capacity(capacity))
+            .collect::<Vec<_>>();
+
+        self.for_each_block(|first_record, block, memo_reader| {
+            // The block is decoded one field at a time, so that
+            // consecutive values decoded are of the same type
+            let mut first_error: Option<Error> = None;
+            for ((field_info, range), column) in fields.iter().zip(columns.iter_mut()) {
+                let result = read_block_column(
+                    block,
+                    record_size,
+                    first_record,
+                    field_info,
+                    range,
+                    memo_reader,
+                    column,
+                );
+                // Report the error that reading record by record would hit first:
+                // the one of the earliest record, and of its first field on a tie
+                if let Err(error) = result {
+                    if first_error
+                        .as_ref()
+                        .map_or(true, |first| error.record_num < first.record_num)
+                    {
+                        first_error = Some(error);
+                    }
+                }
+            }
+            match first_error {
+                Some(error) => Err(error),
+                None => Ok(()),
+            }
+        })?;
+
+        Ok(fields
+            .into_iter()
+            .map(|(field_info, _)| field_info.name)
+            .zip(columns)
+            .collect())
+    }
+
+    /// Reads the values of one field for all the records
+    ///
+    /// Only the requested field is decoded, the other fields
+    /// of the records are skipped.
+    ///
+    /// # Example
+    ///
+    /// ```
+    /// use dbase::FieldValue;
+    /// # fn main() -> Result<(), dbase::Error> {
+    /// let mut reader = dbase::Reader::from_path("tests/data/stations.dbf")?;
+    /// let names = reader.read_column("name")?;
+    /// assert_eq!(
+    ///     names[0],
+    ///     FieldValue::Character(Some("Van Dorn Street".to_owned()))
+    /// );
+    /// # Ok(())
+    /// # }
+    /// ```
+    pub fn read_column(&mut self, field_name: &str) -> Result<Vec<FieldValue>, Error> {
+        let (field_info, range) = self
+            .field_ranges()
+            .into_iter()
+            .find(|(field_info, _)| field_info.name() == field_name)
+            .ok_or_else(|| Error {
+                record_num: 0,
+                field: None,
+                kind: ErrorKind::Message(format!("No field named '{}'", field_name)),
+            })?;
+
+        let capacity = self
+            .records_capacity()
+            .map_err(|error| Error::io_error(error, 0))?;
+        let record_size = self.record_data.len();
+        let mut column = Vec::<FieldValue>::with_capacity(capacity);
+        self.for_each_block(|first_record, block, memo_reader| {
+            read_block_column(
+                block,
+                record_size,
+                first_record,
+                &field_info,
+                &range,
+                memo_reader,
+                &mut column,
+            )
+        })?;
+        Ok(column)
+    }
+
+    /// Returns the number of records for which memory can be reserved up front
+    ///
+    /// The number of records in the header is not trusted as is: a truncated
+    /// or corrupted file may declare far more records than the source holds.
+    fn records_capacity(&mut self) -> std::io::Result<usize> {
+        let position = self.source.seek(SeekFrom::Current(0))?;
+        let end = self.source.seek(SeekFrom::End(0))?;
+        self.source.seek(SeekFrom::Start(position))?;
+        let num_records_in_source = end.saturating_sub(position) / self.record_data.len() as u64;
+        Ok(num_records_in_source.min(u64::from(self.header.num_records)) as usize)
+    }
+
+    /// Returns the info of the fields, except the deletion flag,
+    /// with the range of their bytes in a record.
+    ///
+    /// Records have a fixed layout, a field is always at the same offset.
+    fn field_ranges(&self) -> Vec<(FieldInfo, Range<usize>)> {
+        let mut field_start = 0;
+        let mut ranges = Vec::with_capacity(self.fields_info.len());
+        for field_info in &self.fields_info {
+            let field_end = field_start + field_info.field_length as usize;
+            if !field_info.is_deletion_flag() {
+                ranges.push((field_info.clone(), field_start..field_end));
+            }
+            field_start = field_end;
+        }
+        ranges
+    }
+
+    /// Reads the records by blocks of several records, and calls `f`
+    /// with the index of the first record of the block, the bytes of the block
+    /// and the memo reader.
+    ///
+    /// This makes one read call per block instead of one per record.
+    fn for_each_block<F>(&mut self, mut f: F) -> Result<(), Error>
+    where
+        F: FnMut(usize, &[u8], &mut Option<MemoReader<T>>) -> Result<(), Error>,
+    {
+        let num_records = self.header.num_records as usize;
+        let record_size = self.record_data.len();
+        // Blocks are at least as big as the buffer of a Reader created
+        // with from_path, so that the BufReader reads directly into them
+        let records_per_block = (RECORDS_BLOCK_SIZE + record_size - 1) / record_size;
+        let mut block = vec![0u8; records_per_block.min(num_records) * record_size];
+
+        let mut current_record = 0;
+        while current_record < num_records {
+            let num_block_records = records_per_block.min(num_records - current_record);
+            let block = &mut block[..num_block_records * record_size];
+            read_records(&mut self.source, block, &self.fields_info, current_record)?;
+            f(current_record, block, &mut self.memo_reader)?;
+            current_record += num_block_records;
+        }
+        Ok(())
+    }
+
+    /// Reads the bytes of the record at `current_record` in the internal buffer,
+    /// and returns an iterator over the fields of this record.
+    fn read_next_record_data(&mut self, current_record: usize) -> Result<FieldIterator<T>, Error> {
+        read_records(
+            &mut self.source,
+            &mut self.record_data,
+            &self.fields_info,
+            current_record,
+        )?;
+        Ok(FieldIterator {
+            source: &self.record_data,
+            fields_info: self.fields_info.iter().peekable(),
+            memo_reader: &mut self.memo_reader,
+        })
     }
 
     /// Seek to the start of the record at `index`
@@ -314,8 +523,9 @@ impl Reader<BufReader<File>> {
     /// ```
     pub fn from_path<P: AsRef<Path>>(path: P) -> Result<Self, Error> {
         let p = path.as_ref().to_owned();
-        let bufreader =
-            BufReader::new(File::open(path).map_err(|error| Error::io_error(error, 0))?);
+        let file = File::open(path).map_err(|error| Error::io_error(error, 0))?;
+        // Records are read sequentially, a larger buffer means fewer read calls
+        let bufreader = BufReader::with_capacity(RECORDS_BLOCK_SIZE, file);
         let mut reader = Reader::new(bufreader)?;
         let at_least_one_field_is_memo = reader
             .fields_info
@@ -323,7 +533,7 @@ impl Reader<BufReader<File>> {
             .any(|f_info| f_info.field_type == FieldType::Memo);
 
         if at_least_one_field_is_memo {
-            let memo_type = dbg!(reader.header.file_type.supported_memo_type());
+            let memo_type = reader.header.file_type.supported_memo_type();
             if let Some(mt) = memo_type {
                 let memo_path = match mt {
                     MemoFileType::DbaseMemo | MemoFileType::DbaseMemo4 => p.with_extension("dbt"),
@@ -345,6 +555,73 @@ impl Reader<BufReader<File>> {
     }
 }
 
+/// Fills `records` with the bytes of consecutive records read from the source,
+/// the first one being the record at `first_record`.
+///
+/// When the source runs out of data, the error gives the record
+/// and the field that could not be read entirely.
+fn read_records<R: Read>(
+    source: &mut R,
+    records: &mut [u8],
+    fields_info: &[FieldInfo],
+    first_record: usize,
+) -> Result<(), Error> {
+    let mut num_bytes_read = 0;
+    while num_bytes_read < records.len() {
+        let error = match source.read(&mut records[num_bytes_read..]) {
+            Ok(0) => std::io::Error::new(
+                std::io::ErrorKind::UnexpectedEof,
+                "failed to fill whole buffer",
+            ),
+            Ok(n) => {
+                num_bytes_read += n;
+                continue;
+            }
+            Err(ref error) if error.kind() == std::io::ErrorKind::Interrupted => continue,
+            Err(error) => error,
+        };
+        let record_size = fields_info
+            .iter()
+            .map(|info| info.field_length as usize)
+            .sum::<usize>();
+        let offset_in_record = num_bytes_read % record_size;
+        let mut field_end = 0;
+        let field = fields_info.iter().find(|field_info| {
+            field_end += field_info.field_length as usize;
+            offset_in_record < field_end
+        });
+        return Err(Error {
+            record_num: first_record + num_bytes_read / record_size,
+            field: field.cloned(),
+            kind: ErrorKind::IoError(error),
+        });
+    }
+    Ok(())
+}
+
+/// Decodes the field at `range` in each record of the block,
+/// and pushes the values to the column
+fn read_block_column<T: Read + Seek>(
+    block: &[u8],
+    record_size: usize,
+    first_record: usize,
+    field_info: &FieldInfo,
+    range: &Range<usize>,
+    memo_reader: &mut Option<MemoReader<T>>,
+    column: &mut Vec<FieldValue>,
+) -> Result<(), Error> {
+    for (i, record_data) in block.chunks_exact(record_size).enumerate() {
+        let value = FieldValue::read_from(&record_data[range.clone()], memo_reader, field_info)
+            .map_err(|kind| Error {
+                record_num: first_record + i,
+                field: Some(field_info.clone()),
+                kind,
+            })?;
+        column.push(value);
+    }
+    Ok(())
+}
+
 /// Simple struct to wrap together the value with the name
 /// of the field it belongs to
 pub struct NamedValue<'a, T> {
@@ -361,8 +638,8 @@ pub struct NamedValue<'a, T> {
 /// When trying to read more fields than there are, an EndOfRecord error
 /// will be returned.
 pub struct FieldIterator<'a, T: Read + Seek> {
-    /// The source from where we read the data
-    pub(crate) source: &'a mut T,
+    /// The bytes of the record that are left to be read
+    pub(crate) source: &'a [u8],
     /// The fields that make the record
     pub(crate) fields_info: std::iter::Peekable<std::slice::Iter<'a, FieldInfo>>,
     /// The source where the Memo field data is read
@@ -435,24 +712,6 @@ impl<'a, T: Read + Seek> FieldIterator<'a, T> {
         }
     }
 
-    /// Skips all the remaining field of the record
-    ///
-    /// used internally to make sure the data stream is at the right position
-    /// when we will start reading the next record
-    ///
-    /// Does nothing if the last field of the record was already skipped or read.
-    fn skip_remaining_fields(&mut self) -> Result<(), FieldIOError> {
-        while let Some(field_info) = self.fields_info.next() {
-            if let Err(error) = self.skip_field(field_info) {
-                return Err(FieldIOError {
-                    field: Some(field_info.clone()),
-                    kind: error.into(),
-                });
-            }
-        }
-        Ok(())
-    }
-
     /// Reads the raw bytes of the next field without doing any filtering or trimming
     #[cfg(feature = "serde")]
     pub(crate) fn read_next_field_raw(&mut self) -> Result<Vec<u8>, FieldIOError> {
@@ -466,11 +725,10 @@ impl<'a, T: Read + Seek> FieldIterator<'a, T> {
             })?;
             self.read_next_field_raw()
         } else {
-            let mut buf = vec![0u8; field_info.field_length as usize];
-            self.source.read_exact(&mut buf).map_err(|error| {
+            let field_bytes = self.take_field_bytes(field_info).map_err(|error| {
                 FieldIOError::new(ErrorKind::IoError(error), Some(field_info.to_owned()))
             })?;
-            Ok(buf)
+            Ok(field_bytes.to_vec())
         }
     }
 
@@ -490,12 +748,9 @@ impl<'a, T: Read + Seek> FieldIterator<'a, T> {
                 .peek()
                 .ok_or(FieldIOError::end_of_record())?;
         }
+        let source = self.source;
         let value = self.read_field(field_info)?;
-        self.source
-            .seek(SeekFrom::Current(-i64::from(field_info.field_length)))
-            .map_err(|error| {
-                FieldIOError::new(ErrorKind::IoError(error), Some(field_info.to_owned()))
-            })?;
+        self.source = source;
 
         Ok(NamedValue {
             name: field_info.name(),
@@ -503,16 +758,38 @@ impl<'a, T: Read + Seek> FieldIterator<'a, T> {
         })
     }
 
+    /// Returns the bytes of the field and advances the source past them
+    fn take_field_bytes(&mut self, field_info: &FieldInfo) -> std::io::Result<&'a [u8]> {
+        let field_length = field_info.field_length as usize;
+        if self.source.len() < field_length {
+            return Err(std::io::Error::new(
+                std::io::ErrorKind::UnexpectedEof,
+                "the record is too short to contain the field",
+            ));
+        }
+        let (field_bytes, remaining_bytes) = self.source.split_at(field_length);
+        self.source = remaining_bytes;
+        Ok(field_bytes)
+    }
+
     /// Advance the source to skip the field
     fn skip_field(&mut self, field_info: &FieldInfo) -> std::io::Result<()> {
-        self.source
-            .seek(SeekFrom::Current(i64::from(field_info.field_length)))?;
+        self.take_field_bytes(field_info)?;
         Ok(())
     }
 
     /// read the next field using the given info
     fn read_field(&mut self, field_info: &'a FieldInfo) -> Result<FieldValue, FieldIOError> {
-        match FieldValue::read_from(self.source, self.memo_reader, field_info) {
+        let field_bytes = match self.take_field_bytes(field_info) {
+            Ok(field_bytes) => field_bytes,
+            Err(error) => {
+                return Err(FieldIOError {
+                    field: Some(field_info.clone()),
+                    kind: ErrorKind::IoError(error),
+                })
+            }
+        };
+        match FieldValue::read_from(field_bytes, self.memo_reader, field_info) {
             Ok(value) => Ok(value),
             Err(kind) => Err(FieldIOError {
                 field: Some(field_info.clone()),
@@ -539,6 +816,9 @@ impl<'a, T: Read + Seek> Iterator for FieldIterator<'a, T> {
 impl<'a, T: Read + Seek> FusedIterator for FieldIterator<'a, T> {}
 
 /// Iterator over records contained in the dBase
+///
+/// Records are read one at a time as the iterator advances,
+/// so iterating does not require the whole file to be held in memory.
 pub struct RecordIterator<'a, T: Read + Seek, R: ReadableRecord> {
     reader: &'a mut Reader<T>,
     record_type: std::marker::PhantomData<R>,
@@ -552,22 +832,29 @@ impl<'a, T: Read + Seek, R: ReadableRecord> Iterator for RecordIterator<'a, T, R
         if self.current_record >= self.reader.header.num_records {
             None
         } else {
-            let mut iter = FieldIterator {
-                source: &mut self.reader.source,
-                fields_info: self.reader.fields_info.iter().peekable(),
-                memo_reader: &mut self.reader.memo_reader,
-            };
-
-            let record = R::read_using(&mut iter)
-                .and_then(|record| iter.skip_remaining_fields().and(Ok(record)))
-                .map_err(|error| Error::new(error, self.current_record as usize));
+            let current_record = self.current_record as usize;
+            let record = self
+                .reader
+                .read_next_record_data(current_record)
+                .and_then(|mut iter| {
+                    R::read_using(&mut iter).map_err(|error| Error::new(error, current_record))
+                });
 
             self.current_record += 1;
             Some(record)
         }
     }
+
+    fn size_hint(&self) -> (usize, Option<usize>) {
+        let num_records_left = (self.reader.header.num_records - self.current_record) as usize;
+        (num_records_left, Some(num_records_left))
+    }
 }
 
+impl<'a, T: Read + Seek, R: ReadableRecord> ExactSizeIterator for RecordIterator<'a, T, R> {}
+
+impl<'a, T: Read + Seek, R: ReadableRecord> FusedIterator for RecordIterator<'a, T, R> {}
+
 /// One liner to read the content of a .dbf file
 ///
 /// # Example
@@ -577,7 +864,7 @@ impl<'a, T: Read + Seek, R: ReadableRecord> Iterator for RecordIterator<'a, T, R
 /// assert_eq!(records.len(), 1);
 /// ```
 pub fn read<P: AsRef<Path>>(path: P) -> Result<Vec<Record>, Error> {
-    let mut reader = Reader::from_path(path).unwrap();
+    let mut reader = Reader::from_path(path)?;
     reader.read()
 }
 
@@ -1,3 +1,4 @@
+use std::borrow::Cow;
 use std::convert::{TryFrom, TryInto};
 use std::fmt;
 use std::io::{Read, Seek, SeekFrom, Write};
@@ -260,20 +261,18 @@ pub enum FieldValue {
 }
 
 impl FieldValue {
+    /// Reads the value of the field from the bytes of the field
     pub(crate) fn read_from<T: Read + Seek>(
-        mut source: &mut T,
+        mut field_bytes: &[u8],
         memo_reader: &mut Option<MemoReader<T>>,
         field_info: &FieldInfo,
     ) -> Result<Self, ErrorKind> {
         let value = match field_info.field_type {
-            FieldType::Logical => match source.read_u8()? as char {
-                ' ' | '?' => FieldValue::Logical(None),
-                '1' | '0' | 'T' | 't' | 'Y' | 'y' => FieldValue::Logical(Some(true)),
-                'N' | 'n' | 'F' | 'f' => FieldValue::Logical(Some(false)),
-                _ => FieldValue::Logical(None),
-            },
+            FieldType::Logical => {
+                FieldValue::Logical(LOGICAL_VALUES[field_bytes.read_u8()? as usize])
+            }
             FieldType::Character => {
-                let value = read_string_of_len(&mut source, field_info.field_length)?;
+                let value = read_string(trim_trailing_spaces(field_bytes));
                 let trimmed_value = value.trim();
                 if trimmed_value.is_empty() {
                     FieldValue::Character(None)
@@ -282,7 +281,10 @@ impl FieldValue {
                 }
             }
             FieldType::Numeric => {
-                let value = read_string_of_len(&mut source, field_info.field_length)?;
+                if let Some(value) = parse_decimal_numeric(field_bytes) {
+                    return Ok(FieldValue::Numeric(Some(value)));
+                }
+                let value = read_string(field_bytes);
                 let trimmed_value = value.trim();
                 if trimmed_value.is_empty() || value.chars().all(|c| c == '*') {
                     FieldValue::Numeric(None)
@@ -291,7 +293,7 @@ impl FieldValue {
                 }
             }
             FieldType::Float => {
-                let value = read_string_of_len(&mut source, field_info.field_length)?;
+                let value = read_string(field_bytes);
                 let trimmed_value = value.trim();
                 if trimmed_value.is_empty() || value.chars().all(|c| c == '*') {
                     FieldValue::Float(None)
@@ -300,20 +302,23 @@ impl FieldValue {
                 }
             }
             FieldType::Date => {
-                let value = read_string_of_len(&mut source, field_info.field_length)?;
+                if let Some(date) = Date::parse_yyyymmdd(field_bytes) {
+                    return Ok(FieldValue::Date(Some(date)));
+                }
+                let value = read_string(field_bytes);
                 if value.chars().all(|c| c == ' ') {
                     FieldValue::Date(None)
                 } else {
                     FieldValue::Date(Some(value.parse::<Date>()?))
                 }
             }
-            FieldType::Integer => FieldValue::Integer(source.read_i32::<LittleEndian>()?),
-            FieldType::Double => FieldValue::Double(source.read_f64::<LittleEndian>()?),
-            FieldType::Currency => FieldValue::Currency(source.read_f64::<LittleEndian>()?),
-            FieldType::DateTime => FieldValue::DateTime(DateTime::read_from(&mut source)?),
+            FieldType::Integer => FieldValue::Integer(field_bytes.read_i32::<LittleEndian>()?),
+            FieldType::Double => FieldValue::Double(field_bytes.read_f64::<LittleEndian>()?),
+            FieldType::Currency => FieldValue::Currency(field_bytes.read_f64::<LittleEndian>()?),
+            FieldType::DateTime => FieldValue::DateTime(DateTime::read_from(&mut field_bytes)?),
             FieldType::Memo => {
                 let index_in_memo = if field_info.field_length > 4 {
-                    let string = read_string_of_len(&mut source, field_info.field_length)?;
+                    let string = read_string(trim_trailing_spaces(field_bytes));
                     let trimmed_str = string.trim();
                     if trimmed_str.is_empty() {
                         return Ok(FieldValue::Memo(String::from("")));
@@ -321,7 +326,7 @@ impl FieldValue {
                         trimmed_str.parse::<u32>()?
                     }
                 } else {
-                    source.read_u32::<LittleEndian>()?
+                    field_bytes.read_u32::<LittleEndian>()?
                 };
 
                 if let Some(memo_reader) = memo_reader {
@@ -439,6 +444,51 @@ impl Date {
         }
     }
 
+    /// Parses the 8 ascii digits of a YYYYMMDD date
+    ///
+    /// The digits are validated and combined as a single u64,
+    /// returns None if the bytes are not exactly 8 digits.
+    fn parse_yyyymmdd(bytes: &[u8]) -> Option<Date> {
+        if bytes.len() != 8 {
+            return None;
+        }
+        let mut chunk = [0u8; 8];
+        chunk.copy_from_slice(bytes);
+        let digits = u64::from_le_bytes(chunk).wrapping_sub(0x3030_3030_3030_3030);
+        // A byte lower than b'0' wraps around and a byte greater than b'9'
+        // reaches 16 when adding 6, both set a bit of the high nibble
+        if (digits | digits.wrapping_add(0x0606_0606_0606_0606)) & 0xF0F0_F0F0_F0F0_F0F0 != 0 {
+            return None;
+        }
+        // Combines each pair of digits, the first byte being the first digit:
+        // the even bytes then hold the values of 'YY', 'YY', 'MM' and 'DD'
+        let pairs = (digits * 10 + (digits >> 8)) & 0x00FF_00FF_00FF_00FF;
+        Some(Date {
+            year: ((pairs & 0xFF) * 100 + ((pairs >> 16) & 0xFF)) as u32,
+            month: ((pairs >> 32) & 0xFF) as u32,
+            day: ((pairs >> 48) & 0xFF) as u32,
+        })
+    }
+
+    /// Returns the date as the 8 ascii digits of its YYYYMMDD representation,
+    /// or None if one of its components does not fit
+    fn to_yyyymmdd_bytes(&self) -> Option<[u8; 8]> {
+        if self.year > 9999 || self.month > 99 || self.day > 99 {
+            return None;
+        }
+        let digit = |value: u32| b'0' + value as u8;
+        Some([
+            digit(self.year / 1000),
+            digit(self.year / 100 % 10),
+            digit(self.year / 10 % 10),
+            digit(self.year % 10),
+            digit(self.month / 10),
+            digit(self.month % 10),
+            digit(self.day / 10),
+            digit(self.day % 10),
+        ])
+    }
+
     fn to_julian_day_number(&self) -> i32 {
         let (month, year) = if self.month > 2 {
             (self.month - 3, self.year)
@@ -461,6 +511,9 @@ impl FromStr for Date {
     type Err = std::num::ParseIntError;
 
     fn from_str(s: &str) -> Result<Self, Self::Err> {
+        if let Some(date) = Self::parse_yyyymmdd(s.as_bytes()) {
+            return Ok(date);
+        }
         let year = s[0..4].parse::<u32>()?;
         let month = s[4..6].parse::<u32>()?;
         let day = s[6..8].parse::<u32>()?;
@@ -471,7 +524,10 @@ impl FromStr for Date {
 
 impl std::string::ToString for Date {
     fn to_string(&self) -> String {
-        format!("{:04}{:02}{:02}", self.year, self.month, self.day)
+        match self.to_yyyymmdd_bytes() {
+            Some(bytes) => bytes.iter().map(|&b| b as char).collect(),
+            None => format!("{:04}{:02}{:02}", self.year, self.month, self.day),
+        }
     }
 }
 
@@ -602,6 +658,137 @@ impl WritableAsDbaseField for FieldValue {
             }
         }
     }
+
+    fn write_as_field<W: Write>(
+        &self,
+        field_info: &FieldInfo,
+        dst: &mut W,
+    ) -> Result<(), ErrorKind> {
+        match self {
+            FieldValue::Numeric(value) if field_info.field_type == FieldType::Numeric => {
+                value.write_as_field(field_info, dst)
+            }
+            FieldValue::Float(value) if field_info.field_type == FieldType::Float => {
+                value.write_as_field(field_info, dst)
+            }
+            FieldValue::Character(value) if field_info.field_type == FieldType::Character => {
+                value.write_as_field(field_info, dst)
+            }
+            _ => self.write_as(field_info.field_type, dst),
+        }
+    }
+}
+
+/// Writes the string, cropped to the field length
+///
+/// Non-ASCII strings are cropped on a char boundary so that
+/// no partial UTF-8 sequence is written to the file.
+fn write_character_field<W: Write>(
+    value: &str,
+    field_info: &FieldInfo,
+    dst: &mut W,
+) -> Result<(), ErrorKind> {
+    if field_info.field_type != FieldType::Character {
+        return Err(ErrorKind::IncompatibleType);
+    }
+    let mut len = value.len().min(field_info.field_length as usize);
+    while !value.is_char_boundary(len) {
+        len -= 1;
+    }
+    dst.write_all(&value.as_bytes()[..len])?;
+    Ok(())
+}
+
+/// Enough zeros to fill the decimals of the biggest possible field
+const ZERO_DIGITS: [u8; 255] = [b'0'; 255];
+
+/// Largest float up to which all integers can be represented exactly
+const MAX_EXACT_INTEGER: f64 = 9_007_199_254_740_992.0;
+
+/// Powers of ten that are exactly representable as f64
+const POWERS_OF_TEN: [f64; 23] = [
+    1e0, 1e1, 1e2, 1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9, 1e10, 1e11, 1e12, 1e13, 1e14, 1e15, 1e16,
+    1e17, 1e18, 1e19, 1e20, 1e21, 1e22,
+];
+
+/// Below this, the rounding error of `value * 10^n` is far smaller than 0.5,
+/// so an integral product is the value correctly rounded to n decimals
+const MAX_EXACT_SCALED: f64 = 8_796_093_022_208.0; // 2^43
+
+/// Writes the number with exactly `num_decimal_places` decimals
+fn write_fixed_decimals<W: Write>(
+    value: f64,
+    num_decimal_places: u8,
+    dst: &mut W,
+) -> std::io::Result<()> {
+    if value.fract() == 0.0 && value.abs() < MAX_EXACT_INTEGER {
+        // Integral values (the most common case) do not need
+        // the float formatting machinery
+        let mut buffer = itoa::Buffer::new();
+        dst.write_all(buffer.format(value as i64).as_bytes())?;
+        if num_decimal_places > 0 {
+            dst.write_all(b".")?;
+            dst.write_all(&ZERO_DIGITS[..num_decimal_places as usize])?;
+        }
+        Ok(())
+    } else if let Some(scaled) = POWERS_OF_TEN
+        .get(num_decimal_places as usize)
+        .map(|power| value * power)
+        .filter(|scaled| scaled.fract() == 0.0 && scaled.abs() < MAX_EXACT_SCALED)
+    {
+        // Values that have no more decimals than the field (eg 2481.25)
+        // are written from their digits, with the dot inserted
+        let scaled = scaled as i64;
+        if scaled < 0 {
+            dst.write_all(b"-")?;
+        }
+        let mut buffer = itoa::Buffer::new();
+        let digits = buffer.format(scaled.unsigned_abs()).as_bytes();
+        let num_decimal_places = num_decimal_places as usize;
+        if digits.len() > num_decimal_places {
+            let (integer_part, decimal_part) = digits.split_at(digits.len() - num_decimal_places);
+            dst.write_all(integer_part)?;
+            dst.write_all(b".")?;
+            dst.write_all(decimal_part)
+        } else {
+            dst.write_all(b"0.")?;
+            dst.write_all(&ZERO_DIGITS[..num_decimal_places - digits.len()])?;
+            dst.write_all(digits)
+        }
+    } else {
+        write!(dst, "{:.*}", num_decimal_places as usize, value)
+    }
+}
+
+/// Writes the f32 with exactly `num_decimal_places` decimals
+///
+/// Widening the value to f64 would make the nearest f32 approximation visible
+/// (1234.56 would become 1234.560059), so the digits are taken from the
+/// shortest representation of the f32, and only rounded when it has too many decimals.
+fn write_fixed_decimals_f32<W: Write>(
+    value: f32,
+    num_decimal_places: u8,
+    dst: &mut W,
+) -> std::io::Result<()> {
+    let num_decimal_places = num_decimal_places as usize;
+    let shortest = value.to_string();
+    let num_decimals = shortest.find('.').map(|dot| shortest.len() - dot - 1);
+    match num_decimals {
+        _ if !value.is_finite() => write!(dst, "{:.*}", num_decimal_places, value),
+        Some(num_decimals) if num_decimals <= num_decimal_places => {
+            dst.write_all(shortest.as_bytes())?;
+            dst.write_all(&ZERO_DIGITS[..num_decimal_places - num_decimals])
+        }
+        None => {
+            dst.write_all(shortest.as_bytes())?;
+            if num_decimal_places > 0 {
+                dst.write_all(b".")?;
+                dst.write_all(&ZERO_DIGITS[..num_decimal_places])?;
+            }
+            Ok(())
+        }
+        Some(_) => write!(dst, "{:.*}", num_decimal_places, value),
+    }
 }
 
 impl WritableAsDbaseField for f64 {
@@ -618,12 +805,28 @@ impl WritableAsDbaseField for f64 {
             _ => Err(ErrorKind::IncompatibleType),
         }
     }
+
+    fn write_as_field<W: Write>(
+        &self,
+        field_info: &FieldInfo,
+        dst: &mut W,
+    ) -> Result<(), ErrorKind> {
+        if field_info.field_type == FieldType::Numeric {
+            write_fixed_decimals(*self, field_info.num_decimal_places, dst)?;
+            Ok(())
+        } else {
+            self.write_as(field_info.field_type, dst)
+        }
+    }
 }
 
 impl WritableAsDbaseField for Date {
     fn write_as<W: Write>(&self, field_type: FieldType, dst: &mut W) -> Result<(), ErrorKind> {
         if field_type == FieldType::Date {
-            write!(dst, "{:04}{:02}{:02}", self.year, self.month, self.day)?;
+            match self.to_yyyymmdd_bytes() {
+                Some(bytes) => dst.write_all(&bytes)?,
+                None => write!(dst, "{:04}{:02}{:02}", self.year, self.month, self.day)?,
+            }
             Ok(())
         } else {
             Err(ErrorKind::IncompatibleType)
@@ -637,9 +840,7 @@ impl WritableAsDbaseField for Option<Date> {
             if let Some(date) = self {
                 date.write_as(field_type, dst)?;
             } else {
-                for _ in 0..8 {
-                    dst.write_u8(b' ')?;
-                }
+                dst.write_all(&[b' '; 8])?;
             }
             Ok(())
         } else {
@@ -660,6 +861,19 @@ impl WritableAsDbaseField for Option<f64> {
             Err(ErrorKind::IncompatibleType)
         }
     }
+
+    fn write_as_field<W: Write>(
+        &self,
+        field_info: &FieldInfo,
+        dst: &mut W,
+    ) -> Result<(), ErrorKind> {
+        match self {
+            Some(value) if field_info.field_type == FieldType::Numeric => {
+                value.write_as_field(field_info, dst)
+            }
+            _ => self.write_as(field_info.field_type, dst),
+        }
+    }
 }
 
 impl WritableAsDbaseField for f32 {
@@ -671,6 +885,19 @@ impl WritableAsDbaseField for f32 {
             Err(ErrorKind::IncompatibleType)
         }
     }
+
+    fn write_as_field<W: Write>(
+        &self,
+        field_info: &FieldInfo,
+        dst: &mut W,
+    ) -> Result<(), ErrorKind> {
+        if field_info.field_type == FieldType::Float {
+            write_fixed_decimals_f32(*self, field_info.num_decimal_places, dst)?;
+            Ok(())
+        } else {
+            Err(ErrorKind::IncompatibleType)
+        }
+    }
 }
 
 impl WritableAsDbaseField for Option<f32> {
@@ -684,6 +911,17 @@ impl WritableAsDbaseField for Option<f32> {
             Err(ErrorKind::IncompatibleType)
         }
     }
+
+    fn write_as_field<W: Write>(
+        &self,
+        field_info: &FieldInfo,
+        dst: &mut W,
+    ) -> Result<(), ErrorKind> {
+        match self {
+            Some(value) => value.write_as_field(field_info, dst),
+            None => self.write_as(field_info.field_type, dst),
+        }
+    }
 }
 
 impl WritableAsDbaseField for String {
@@ -695,6 +933,14 @@ impl WritableAsDbaseField for String {
             Err(ErrorKind::IncompatibleType)
         }
     }
+
+    fn write_as_field<W: Write>(
+        &self,
+        field_info: &FieldInfo,
+        dst: &mut W,
+    ) -> Result<(), ErrorKind> {
+        write_character_field(self, field_info, dst)
+    }
 }
 
 impl WritableAsDbaseField for Option<String> {
@@ -708,6 +954,17 @@ impl WritableAsDbaseField for Option<String> {
             Err(ErrorKind::IncompatibleType)
         }
     }
+
+    fn write_as_field<W: Write>(
+        &self,
+        field_info: &FieldInfo,
+        dst: &mut W,
+    ) -> Result<(), ErrorKind> {
+        match self {
+            Some(s) => s.write_as_field(field_info, dst),
+            None => self.write_as(field_info.field_type, dst),
+        }
+    }
 }
 
 impl WritableAsDbaseField for &str {
@@ -719,6 +976,14 @@ impl WritableAsDbaseField for &str {
             Err(ErrorKind::IncompatibleType)
         }
     }
+
+    fn write_as_field<W: Write>(
+        &self,
+        field_info: &FieldInfo,
+        dst: &mut W,
+    ) -> Result<(), ErrorKind> {
+        write_character_field(self, field_info, dst)
+    }
 }
 
 impl WritableAsDbaseField for bool {
@@ -869,16 +1134,92 @@ mod ser {
     }
 }
 
-fn read_string_of_len<T: Read>(source: &mut T, len: u8) -> Result<String, std::io::Error> {
-    let mut bytes = Vec::<u8>::new();
-    bytes.resize(len as usize, 0u8);
-    source.read_exact(&mut bytes)?;
+/// Value of a Logical field for each possible byte,
+/// ' ', '?' and unknown bytes are read as None
+static LOGICAL_VALUES: [Option<bool>; 256] = {
+    let true_bytes = b"10TtYy";
+    let false_bytes = b"NnFf";
+    let mut values = [None; 256];
+    let mut i = 0;
+    while i < true_bytes.len() {
+        values[true_bytes[i] as usize] = Some(true);
+        i += 1;
+    }
+    let mut i = 0;
+    while i < false_bytes.len() {
+        values[false_bytes[i] as usize] = Some(false);
+        i += 1;
+    }
+    values
+};
+
+/// Returns the bytes without their trailing spaces (the padding of the field)
+///
+/// Fields are often mostly padding, so the bytes are compared 8 at a time.
+fn trim_trailing_spaces(bytes: &[u8]) -> &[u8] {
+    const SPACES: u64 = u64::from_ne_bytes([b' '; 8]);
+    let mut end = bytes.len();
+    while end >= 8 {
+        let mut chunk = [0u8; 8];
+        chunk.copy_from_slice(&bytes[end - 8..end]);
+        if u64::from_ne_bytes(chunk) != SPACES {
+            break;
+        }
+        end -= 8;
+    }
+    while end > 0 && bytes[end - 1] == b' ' {
+        end -= 1;
+    }
+    &bytes[..end]
+}
+
+/// Parses the bytes of a Numeric field holding a decimal number (eg '-12.50')
+///
+/// The digits are read as an integer mantissa, then divided by the power of ten
+/// of the number of decimals. Both are exactly representable, so the division
+/// gives the correctly rounded value, the same as `str::parse`.
+///
+/// Returns None for anything that is not an optionally signed number with at most
+/// 15 digits surrounded by spaces, such values are left to `str::parse`.
+fn parse_decimal_numeric(bytes: &[u8]) -> Option<f64> {
+    let start = bytes.iter().position(|&b| b != b' ')?;
+    let bytes = trim_trailing_spaces(&bytes[start..]);
+    let (is_negative, bytes) = match bytes.split_first() {
+        Some((b'-', bytes)) => (true, bytes),
+        Some((b'+', bytes)) => (false, bytes),
+        _ => (false, bytes),
+    };
+    let (integer_digits, decimal_digits) = match bytes.iter().position(|&b| b == b'.') {
+        Some(dot) => (&bytes[..dot], &bytes[dot + 1..]),
+        None => (bytes, &bytes[bytes.len()..]),
+    };
+    let num_digits = integer_digits.len() + decimal_digits.len();
+    // Mantissas with more digits may not be exactly representable
+    if num_digits == 0 || num_digits > 15 {
+        return None;
+    }
+    let mut mantissa = 0u64;
+    for &byte in integer_digits.iter().chain(decimal_digits) {
+        let digit = byte.wrapping_sub(b'0');
+        if digit > 9 {
+            return None;
+        }
+        mantissa = mantissa * 10 + u64::from(digit);
+    }
+    let value = mantissa as f64 / POWERS_OF_TEN[decimal_digits.len()];
+    Some(if is_negative { -value } else { value })
+}
+
+/// Decodes the bytes as a string, stopping at the first null byte.
+///
+/// No copy is made when the bytes are valid UTF-8.
+fn read_string<'a>(bytes: &'a [u8]) -> Cow<'a, str> {
     // Trims the null bytes: string cannot be properly trimmed otherwise
     let trimmed_bytes = match bytes.split(|b| b == &b'\0').next() {
         Some(trimmed_bytes) => trimmed_bytes,
-        None => &bytes,
+        None => bytes,
     };
-    Ok(String::from_utf8_lossy(&trimmed_bytes).into_owned())
+    String::from_utf8_lossy(trimmed_bytes)
 }
 
 #[cfg(test)]
@@ -905,9 +1246,12 @@ mod test {
         let mut out = Cursor::new(Vec::<u8>::with_capacity(field_info.field_length as usize));
         value.write_as(field_info.field_type, &mut out).unwrap();
 
-        out.set_position(0);
-
-        let read_value = FieldValue::read_from(&mut out, &mut None, field_info).unwrap();
+        let read_value = FieldValue::read_from(
+            out.get_ref(),
+            &mut None::<MemoReader<Cursor<Vec<u8>>>>,
+            field_info,
+        )
+        .unwrap();
         assert_eq!(value, &read_value);
     }
 
@@ -923,6 +1267,37 @@ mod test {
         test_we_can_read_back(&field_info, &date);
     }
 
+    #[test]
+    fn date_to_string() {
+        assert_eq!(Date::new(1, 1, 2019).to_string(), "20190101");
+        assert_eq!(Date::new(31, 12, 999).to_string(), "09991231");
+        assert_eq!(Date::new(0, 0, 0).to_string(), "00000000");
+    }
+
+    #[test]
+    fn test_parse_yyyymmdd() {
+        assert_eq!(
+            Date::parse_yyyymmdd(b"20190101"),
+            Some(Date::new(1, 1, 2019))
+        );
+        assert_eq!(
+            Date::parse_yyyymmdd(b"19931231"),
+            Some(Date::new(31, 12, 1993))
+        );
+        assert_eq!(Date::parse_yyyymmdd(b"00000000"), Some(Date::new(0, 0, 0)));
+        assert_eq!(
+            Date::parse_yyyymmdd(b"99991231"),
+            Some(Date::new(31, 12, 9999))
+        );
+        assert_eq!(Date::parse_yyyymmdd(b"        "), None);
+        assert_eq!(Date::parse_yyyymmdd(b"2019010a"), None);
+        assert_eq!(Date::parse_yyyymmdd(b"2019/1/1"), None);
+        assert_eq!(Date::parse_yyyymmdd(b"2019010:"), None);
+        assert_eq!(Date::parse_yyyymmdd(b"/0190101"), None);
+        assert_eq!(Date::parse_yyyymmdd(b"2019010"), None);
+        assert_eq!(Date::parse_yyyymmdd(b"201901011"), None);
+    }
+
     #[test]
     fn test_write_read_empty_date() {
         let date = FieldValue::Date(None);
@@ -947,9 +1322,14 @@ mod test {
         field.write_as(FieldType::Character, &mut out).unwrap();
 
         let record_info = create_temp_field_info(FieldType::Character, out.position() as u8);
-        out.set_position(0);
 
-        match FieldValue::read_from(&mut out, &mut None, &record_info).unwrap() {
+        match FieldValue::read_from(
+            out.get_ref(),
+            &mut None::<MemoReader<Cursor<Vec<u8>>>>,
+            &record_info,
+        )
+        .unwrap()
+        {
             FieldValue::Character(s) => {
                 assert_eq!(s, Some(String::from("🤔")));
             }
@@ -957,6 +1337,176 @@ mod test {
         }
     }
 
+    fn write_as_field_to_string(field_info: &FieldInfo, value: &FieldValue) -> String {
+        let mut out = Cursor::new(Vec::<u8>::new());
+        value.write_as_field(field_info, &mut out).unwrap();
+        String::from_utf8(out.into_inner()).unwrap()
+    }
+
+    #[test]
+    fn read_logical() {
+        let field_info = create_temp_field_info(FieldType::Logical, 1);
+        let expected = [
+            (b'T', Some(true)),
+            (b'y', Some(true)),
+            (b'1', Some(true)),
+            (b'F', Some(false)),
+            (b'n', Some(false)),
+            (b' ', None),
+            (b'?', None),
+            (b'x', None),
+            (0xFF, None),
+        ];
+        for (byte, value) in &expected {
+            let read_value = FieldValue::read_from(
+                &[*byte],
+                &mut None::<MemoReader<Cursor<Vec<u8>>>>,
+                &field_info,
+            )
+            .unwrap();
+            assert_eq!(read_value, FieldValue::Logical(*value));
+        }
+    }
+
+    #[test]
+    fn test_parse_decimal_numeric() {
+        assert_eq!(parse_decimal_numeric(b"        42"), Some(42.0));
+        assert_eq!(parse_decimal_numeric(b"-7"), Some(-7.0));
+        assert_eq!(parse_decimal_numeric(b" +0042    "), Some(42.0));
+        assert_eq!(
+            parse_decimal_numeric(b"999999999999999"),
+            Some(999999999999999.0)
+        );
+        assert_eq!(parse_decimal_numeric(b"  50000.50"), Some(50000.50));
+        assert_eq!(parse_decimal_numeric(b"-0.05"), Some(-0.05));
+        assert_eq!(parse_decimal_numeric(b".5"), Some(0.5));
+        assert_eq!(parse_decimal_numeric(b"5."), Some(5.0));
+        assert_eq!(parse_decimal_numeric(b"9999999999999999"), None);
+        assert_eq!(parse_decimal_numeric(b"99999999.99999999"), None);
+        assert_eq!(parse_decimal_numeric(b"1.2.3"), None);
+        assert_eq!(parse_decimal_numeric(b"1e5"), None);
+        assert_eq!(parse_decimal_numeric(b"4 2"), None);
+        assert_eq!(parse_decimal_numeric(b"42\0\0"), None);
+        assert_eq!(parse_decimal_numeric(b"***"), None);
+        assert_eq!(parse_decimal_numeric(b"-"), None);
+        assert_eq!(parse_decimal_numeric(b"."), None);
+        assert_eq!(parse_decimal_numeric(b"    "), None);
+        assert_eq!(parse_decimal_numeric(b""), None);
+    }
+
+    #[test]
+    fn decimal_numeric_matches_str_parse() {
+        for i in -20_000..20_000 {
+            for num_decimals in 0..8 {
+                let string = format!("{:.*}", num_decimals, i as f64 * 0.37);
+                assert_eq!(
+                    parse_decimal_numeric(string.as_bytes()),
+                    Some(string.parse::<f64>().unwrap()),
+                    "{}",
+                    string
+                );
+            }
+        }
+    }
+
+    #[test]
+    fn test_trim_trailing_spaces() {
+        assert_eq!(trim_trailing_spaces(b""), b"");
+        assert_eq!(trim_trailing_spaces(b"       "), b"");
+        assert_eq!(trim_trailing_spaces(b"                 "), b"");
+        assert_eq!(trim_trailing_spaces(b"  abc"), b"  abc");
+        assert_eq!(trim_trailing_spaces(b"abc    "), b"abc");
+        assert_eq!(trim_trailing_spaces(b"abc         "), b"abc");
+        assert_eq!(
+            trim_trailing_spaces(b"a b c d e f g h         "),
+            b"a b c d e f g h"
+        );
+        assert_eq!(trim_trailing_spaces(b"abc\0        "), b"abc\0");
+    }
+
+    #[test]
+    fn write_cropped_utf8_char() {
+        // 'é' is 2 bytes long, it does not fit in the last byte of the field
+        let field_info = create_temp_field_info(FieldType::Character, 4);
+        let value = FieldValue::Character(Some(String::from("abcé")));
+        assert_eq!(write_as_field_to_string(&field_info, &value), "abc");
+
+        let value = FieldValue::Character(Some(String::from("abcdef")));
+        assert_eq!(write_as_field_to_string(&field_info, &value), "abcd");
+    }
+
+    #[test]
+    fn write_numeric_with_fixed_decimals() {
+        let mut field_info = create_temp_field_info(FieldType::Numeric, 20);
+        field_info.num_decimal_places = 2;
+
+        let expected = [
+            (24.0, "24.00"),
+            (-7.0, "-7.00"),
+            (3.14659, "3.15"),
+            (2481.126, "2481.13"),
+            (0.5, "0.50"),
+        ];
+        for (value, expected_str) in &expected {
+            let value = FieldValue::Numeric(Some(*value));
+            assert_eq!(&write_as_field_to_string(&field_info, &value), expected_str);
+        }
+        assert_eq!(
+            write_as_field_to_string(&field_info, &FieldValue::Numeric(None)),
+            ""
+        );
+
+        field_info.num_decimal_places = 0;
+        let value = FieldValue::Numeric(Some(42.0));
+        assert_eq!(write_as_field_to_string(&field_info, &value), "42");
+    }
+
+    #[test]
+    fn fixed_decimals_match_std_formatting() {
+        let values = (0..4000)
+            .map(|i| i as f64 / 8.0 - 250.0)
+            .chain((0..4000).map(|i| i as f64 * 0.01 - 20.0))
+            .chain(vec![0.05, -0.05, 2.675, 1e-7, 123456.789, 1e15 + 0.5, 1e30]);
+        for value in values {
+            for num_decimal_places in 0..8 {
+                let mut out = Vec::<u8>::new();
+                write_fixed_decimals(value, num_decimal_places, &mut out).unwrap();
+                assert_eq!(
+                    String::from_utf8(out).unwrap(),
+                    format!("{:.*}", num_decimal_places as usize, value)
+                );
+            }
+        }
+    }
+
+    #[test]
+    fn write_float_with_fixed_decimals() {
+        let mut field_info = create_temp_field_info(FieldType::Float, 20);
+        field_info.num_decimal_places = 5;
+
+        let value = FieldValue::Float(Some(9.87));
+        assert_eq!(write_as_field_to_string(&field_info, &value), "9.87000");
+        let value = FieldValue::Float(Some(12.0));
+        assert_eq!(write_as_field_to_string(&field_info, &value), "12.00000");
+
+        // The f32 must not be written with the digits of its f64 widening
+        field_info.num_decimal_places = 6;
+        let expected = [
+            (1234.56, "1234.560000"),
+            (99999.99, "99999.990000"),
+            (-0.5, "-0.500000"),
+            (2.7182817, "2.718282"),
+        ];
+        for (value, expected_str) in &expected {
+            let value = FieldValue::Float(Some(*value));
+            assert_eq!(&write_as_field_to_string(&field_info, &value), expected_str);
+        }
+
+        field_info.num_decimal_places = 0;
+        let value = FieldValue::Float(Some(42.0));
+        assert_eq!(write_as_field_to_string(&field_info, &value), "42");
+    }
+
     #[test]
     fn write_read_float() {
         let field = FieldValue::Float(Some(12.43));
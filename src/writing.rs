@@ -14,6 +14,13 @@ use reading::TableInfo;
 /// A dbase file ends with this byte
 const FILE_TERMINATOR: u8 = 0x1A;
 
+/// Enough pad bytes to fill the biggest possible field
+const PAD_BYTES: [u8; 255] = [b' '; 255];
+
+/// Capacity of the buffer of the files created by the writer,
+/// so that many records are written with one call
+const FILE_BUFFER_SIZE: usize = 64 * 1024;
+
 /// Builder to be used to create a [TableWriter](struct.TableWriter.html).
 ///
 /// The dBase format il akin to a database, thus you have to specify the fields
@@ -199,13 +206,14 @@ impl TableWriterBuilder {
     /// Helper function to set create a file at the given path
     /// and make the writer write to the newly created file.
     ///
-    /// This function wraps the `File` in a `BufWriter` to increase performance.
+    /// This function wraps the `File` in a `BufWriter` to increase performance,
+    /// records are written to the file by blocks of 64 KiB.
     pub fn build_with_file_dest<P: AsRef<Path>>(
         self,
         path: P,
     ) -> Result<TableWriter<BufWriter<File>>, Error> {
         let file = File::create(path).map_err(|err| Error::io_error(err, 0))?;
-        let dst = BufWriter::new(file);
+        let dst = BufWriter::with_capacity(FILE_BUFFER_SIZE, file);
         Ok(self.build_with_dest(dst))
     }
 
@@ -256,6 +264,18 @@ mod private {
 /// This trait is 'private' and cannot be implemented on your custom types.
 pub trait WritableAsDbaseField: private::Sealed {
     fn write_as<W: Write>(&self, field_type: FieldType, dst: &mut W) -> Result<(), ErrorKind>;
+
+    /// Writes the value as the given field
+    ///
+    /// Contrary to `write_as`, numbers written to Numeric and Float fields
+    /// have exactly the number of decimal places declared for the field.
+    fn write_as_field<W: Write>(
+        &self,
+        field_info: &FieldInfo,
+        dst: &mut W,
+    ) -> Result<(), ErrorKind> {
+        self.write_as(field_info.field_type, dst)
+    }
 }
 
 /// Trait to be implemented by struct that you want to be able to write to (serialize)
@@ -326,64 +346,25 @@ impl<'a, W: Write> FieldWriter<'a, W> {
             self.buffer.set_position(0);
 
             field_value
-                .write_as(field_info.field_type, &mut self.buffer)
+                .write_as_field(field_info, &mut self.buffer)
                 .map_err(|kind| FieldIOError::new(kind, Some(field_info.clone())))?;
 
-            let mut bytes_written = self.buffer.position();
-            let mut bytes_to_pad = i64::from(field_info.field_length) - bytes_written as i64;
+            let bytes_to_pad = i64::from(field_info.field_length) - self.buffer.position() as i64;
             if bytes_to_pad > 0 {
-                if field_info.field_type == FieldType::Float
-                    || field_info.field_type == FieldType::Numeric
-                {
-                    // Depending on the locale, the dot might not be the delimiter for floating point
-                    // but we are not yet ready to handle correctly codepages, etc
-                    let mut maybe_dot_pos = self.buffer.get_ref()
-                        [..self.buffer.position() as usize]
-                        .iter()
-                        .position(|b| *b == b'.');
-                    if maybe_dot_pos.is_none() {
-                        write!(self.buffer, ".").map_err(|error| {
-                            FieldIOError::new(ErrorKind::IoError(error), Some(field_info.clone()))
-                        })?;
-                        bytes_written = self.buffer.position();
-                        maybe_dot_pos = Some((bytes_written - 1) as usize)
-                    } else {
-                        maybe_dot_pos = Some(maybe_dot_pos.unwrap() + 1);
-                    }
-                    let dot_pos = maybe_dot_pos.unwrap();
-                    let missing_decimals =
-                        field_info.num_decimal_places - (bytes_written - dot_pos as u64) as u8;
-                    for _ in 0..missing_decimals {
-                        write!(self.buffer, "0").map_err(|error| {
-                            FieldIOError::new(ErrorKind::IoError(error), Some(field_info.clone()))
-                        })?;
-                    }
-                    bytes_written = self.buffer.position();
-                    bytes_to_pad = i64::from(field_info.field_length) - bytes_written as i64;
-                }
-                for _ in 0..bytes_to_pad {
-                    write!(self.buffer, " ").map_err(|error| {
-                        FieldIOError::new(ErrorKind::IoError(error), Some(field_info.clone()))
-                    })?;
-                }
-                let field_bytes = self.buffer.get_ref();
-                debug_assert_eq!(self.buffer.position(), field_info.field_length as u64);
-                self.dst
-                    .write_all(&field_bytes[..self.buffer.position() as usize])
-                    .map_err(|error| {
-                        FieldIOError::new(ErrorKind::IoError(error), Some(field_info.clone()))
-                    })?;
-            } else {
-                // The current field value size exceeds the one one set
-                // when creating the writer, we just crop
-                let field_bytes = self.buffer.get_ref();
-                debug_assert_eq!(self.buffer.position(), field_info.field_length as u64);
-                self.dst
-                    .write_all(&field_bytes[..field_info.field_length as usize])
+                self.buffer
+                    .write_all(&PAD_BYTES[..bytes_to_pad as usize])
                     .map_err(|error| {
                         FieldIOError::new(ErrorKind::IoError(error), Some(field_info.clone()))
                     })?;
             }
+            // A value whose size exceeds the one set
+            // when creating the writer is cropped
+            let field_bytes = self.buffer.get_ref();
+            self.dst
+                .write_all(&field_bytes[..field_info.field_length as usize])
+                .map_err(|error| {
+                    FieldIOError::new(ErrorKind::IoError(error), Some(field_info.clone()))
+                })?;
             Ok(())
         } else {
             Err(FieldIOError::new(ErrorKind::TooManyFields, None))
@@ -401,11 +382,12 @@ impl<'a, W: Write> FieldWriter<'a, W> {
                 self.dst.write_all(value).map_err(|error| {
                     FieldIOError::new(ErrorKind::IoError(error), Some(field_info.clone()))
                 })?;
-                for _ in 0..field_info.field_length - value.len() as u8 {
-                    write!(self.dst, " ").map_err(|error| {
+                let bytes_to_pad = field_info.field_length as usize - value.len();
+                self.dst
+                    .write_all(&PAD_BYTES[..bytes_to_pad])
+                    .map_err(|error| {
                         FieldIOError::new(ErrorKind::IoError(error), Some(field_info.clone()))
                     })?;
-                }
             } else {
                 self.dst
                     .write_all(&value[..field_info.field_length as usize])
@@ -440,16 +422,24 @@ pub struct TableWriter<W: Write + Seek> {
     header: Header,
     /// Buffer used by the FieldWriter
     buffer: Cursor<Vec<u8>>,
+    /// Buffer in which a record is assembled before being written
+    record_data: Vec<u8>,
     closed: bool,
 }
 
 impl<W: Write + Seek> TableWriter<W> {
     fn new(dst: W, fields_info: Vec<FieldInfo>, origin_header: Header) -> Self {
+        let record_size = std::mem::size_of::<u8>()
+            + fields_info
+                .iter()
+                .map(|info| info.field_length as usize)
+                .sum::<usize>();
         Self {
             dst,
             fields_info,
             header: origin_header,
             buffer: Cursor::new(vec![0u8; 255]),
+            record_data: Vec::with_capacity(record_size),
             closed: false,
         }
     }
@@ -471,18 +461,17 @@ impl<W: Write + Seek> TableWriter<W> {
     ///
     /// writer.write_record(&record)?;
     ///
-    /// # let ignored_result = std::fs::remove_file("record.dbf");
+    /// # drop(writer);
+    /// # let ignored_result = std::fs::remove_file("records.dbf");
     /// Ok(())
     /// # }
     /// ```
     pub fn write_record<R: WritableRecord>(&mut self, record: &R) -> Result<(), Error> {
-        if self.header.num_records == 0 {
-            // reserve the header
-            self.write_header()?;
-        }
-
+        // The record is assembled in memory, so that it is written
+        // with one call, and not written at all if one of its fields fails
+        self.record_data.clear();
         let mut field_writer = FieldWriter {
-            dst: &mut self.dst,
+            dst: &mut self.record_data,
             fields_info: self.fields_info.iter().peekable(),
             buffer: &mut self.buffer,
         };
@@ -505,6 +494,13 @@ impl<W: Write + Seek> TableWriter<W> {
             });
         }
 
+        if self.header.num_records == 0 {
+            // reserve the header
+            self.write_header()?;
+        }
+        self.dst
+            .write_all(&self.record_data)
+            .map_err(|error| Error::io_error(error, current_record_num))?;
         self.header.num_records += 1;
         Ok(())
     }
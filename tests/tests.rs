@@ -13,6 +13,7 @@ use std::fmt::Debug;
 const LINE_DBF: &str = "./tests/data/line.dbf";
 const NONE_FLOAT_DBF: &str = "./tests/data/contain_none_float.dbf";
 const NULL_PADDED_NUMERIC_DBF: &str = "./tests/data/contain_null_padded_numeric.dbf";
+const STATIONS_DBF: &str = "./tests/data/stations.dbf";
 
 fn write_read_compare<R: WritableRecord + ReadableRecord + Debug + PartialEq>(
     records: &Vec<R>,
@@ -259,3 +260,225 @@ fn the_classical_user_record_example() {
 
     assert_eq!(read_records, users);
 }
+
+#[test]
+fn test_record_iterator_len() {
+    let mut reader = Reader::from_path(STATIONS_DBF).unwrap();
+    let num_records = reader.header().num_records as usize;
+
+    let mut iter = reader.iter_records();
+    assert_eq!(iter.len(), num_records);
+    iter.next().unwrap().unwrap();
+    assert_eq!(iter.len(), num_records - 1);
+
+    let remaining = iter.map(|r| r.unwrap()).count();
+    assert_eq!(remaining, num_records - 1);
+}
+
+#[test]
+fn test_read_columns() {
+    let records = dbase::read(STATIONS_DBF).unwrap();
+
+    let mut reader = Reader::from_path(STATIONS_DBF).unwrap();
+    let columns = reader.read_columns().unwrap();
+
+    assert_eq!(columns.len(), reader.fields().len() - 1);
+    for (name, column) in &columns {
+        assert_eq!(column.len(), records.len());
+        for (value, record) in column.iter().zip(&records) {
+            assert_eq!(Some(value), record.get(name));
+        }
+    }
+}
+
+#[test]
+fn test_read_column() {
+    let columns = Reader::from_path(STATIONS_DBF)
+        .unwrap()
+        .read_columns()
+        .unwrap();
+
+    let mut reader = Reader::from_path(STATIONS_DBF).unwrap();
+    let field_names = reader
+        .fields()
+        .iter()
+        .map(|info| info.name().to_owned())
+        .collect::<Vec<_>>();
+    for name in field_names.iter().filter(|name| *name != "DeletionFlag") {
+        reader.seek(0).unwrap();
+        assert_eq!(&reader.read_column(name).unwrap(), &columns[name]);
+    }
+
+    assert!(reader.read_column("not_a_field").is_err());
+}
+
+#[derive(Debug, PartialEq)]
+struct StationName {
+    name: String,
+}
+
+impl ReadableRecord for StationName {
+    fn read_using<T>(field_iterator: &mut FieldIterator<T>) -> Result<Self, FieldIOError>
+    where
+        T: Read + Seek,
+    {
+        // Only read the first field, the others are left unread
+        Ok(Self {
+            name: field_iterator.read_next_field_as()?.value,
+        })
+    }
+}
+
+#[test]
+fn test_partially_read_records() {
+    let records = dbase::read(STATIONS_DBF).unwrap();
+
+    let mut reader = Reader::from_path(STATIONS_DBF).unwrap();
+    let names = reader.read_as::<StationName>().unwrap();
+
+    assert_eq!(names.len(), records.len());
+    for (station_name, record) in names.iter().zip(&records) {
+        assert_eq!(
+            record.get("name"),
+            Some(&FieldValue::Character(Some(station_name.name.clone())))
+        );
+    }
+}
+
+#[test]
+fn test_failed_record_is_not_written() {
+    let mut cursor = Cursor::new(Vec::<u8>::new());
+    {
+        let mut writer = TableWriterBuilder::new()
+            .add_character_field("name".try_into().unwrap(), 20)
+            .add_numeric_field("value".try_into().unwrap(), 10, 2)
+            .build_with_dest(&mut cursor);
+
+        let mut bad_record = Record::default();
+        bad_record.insert(
+            "name".to_owned(),
+            FieldValue::Character(Some("bad".to_owned())),
+        );
+        // The second field has the wrong type
+        bad_record.insert("value".to_owned(), FieldValue::Logical(Some(true)));
+        assert!(writer.write_record(&bad_record).is_err());
+
+        let mut good_record = Record::default();
+        good_record.insert(
+            "name".to_owned(),
+            FieldValue::Character(Some("good".to_owned())),
+        );
+        good_record.insert("value".to_owned(), FieldValue::Numeric(Some(1.5)));
+        writer.write_record(&good_record).unwrap();
+    }
+    cursor.set_position(0);
+
+    let records = Reader::new(cursor).unwrap().read().unwrap();
+    assert_eq!(records.len(), 1);
+    assert_eq!(
+        records[0].get("name"),
+        Some(&FieldValue::Character(Some("good".to_owned())))
+    );
+    assert_eq!(
+        records[0].get("value"),
+        Some(&FieldValue::Numeric(Some(1.5)))
+    );
+}
+
+/// Returns the bytes of the file, with its number of records
+/// set to a value way bigger than what the file holds
+fn read_with_corrupted_num_records(path: &str) -> Cursor<Vec<u8>> {
+    let mut bytes = std::fs::read(path).unwrap();
+    bytes[4..8].copy_from_slice(&u32::MAX.to_le_bytes());
+    Cursor::new(bytes)
+}
+
+#[test]
+fn test_read_columns_corrupted_num_records() {
+    let mut reader = Reader::new(read_with_corrupted_num_records(LINE_DBF)).unwrap();
+    assert!(reader.read_columns().is_err());
+}
+
+#[test]
+fn test_read_column_corrupted_num_records() {
+    let mut reader = Reader::new(read_with_corrupted_num_records(LINE_DBF)).unwrap();
+    assert!(reader.read_column("name").is_err());
+}
+
+#[test]
+fn test_read_columns_truncated_record() {
+    let mut bytes = std::fs::read(STATIONS_DBF).unwrap();
+    let offset_to_first_record = u16::from_le_bytes([bytes[8], bytes[9]]) as usize;
+    let size_of_record = u16::from_le_bytes([bytes[10], bytes[11]]) as usize;
+    // The second record stops in the middle of its first field
+    bytes.truncate(offset_to_first_record + size_of_record + 3);
+
+    let error = Reader::new(Cursor::new(bytes.clone()))
+        .unwrap()
+        .read()
+        .unwrap_err();
+    assert_eq!(error.record_num(), 1);
+    assert_eq!(
+        error.field().as_ref().map(|field| field.name()),
+        Some("name")
+    );
+
+    let error = Reader::new(Cursor::new(bytes))
+        .unwrap()
+        .read_columns()
+        .unwrap_err();
+    assert_eq!(error.record_num(), 1);
+    assert_eq!(
+        error.field().as_ref().map(|field| field.name()),
+        Some("name")
+    );
+}
+
+#[test]
+fn test_read_corrupted_num_records() {
+    let mut reader = Reader::new(read_with_corrupted_num_records(LINE_DBF)).unwrap();
+    assert!(reader.read().is_err());
+}
+
+#[test]
+fn test_read_columns_reports_first_bad_value_in_record_order() {
+    let mut cursor = Cursor::new(Vec::<u8>::new());
+    {
+        let writer = TableWriterBuilder::new()
+            .add_numeric_field("a".try_into().unwrap(), 10, 0)
+            .add_numeric_field("b".try_into().unwrap(), 10, 0)
+            .build_with_dest(&mut cursor);
+        let records = (0..2)
+            .map(|_| {
+                let mut record = Record::default();
+                record.insert("a".to_owned(), FieldValue::Numeric(Some(1.0)));
+                record.insert("b".to_owned(), FieldValue::Numeric(Some(2.0)));
+                record
+            })
+            .collect::<Vec<_>>();
+        writer.write_records(&records).unwrap();
+    }
+    let mut bytes = cursor.into_inner();
+    let offset_to_first_record = u16::from_le_bytes([bytes[8], bytes[9]]) as usize;
+    // Each record is the deletion flag followed by 'a' and 'b'
+    let record_size = 1 + 10 + 10;
+    // Record 0 has a bad 'b', record 1 has a bad 'a'
+    let bad_b_of_record_0 = offset_to_first_record + 11;
+    let bad_a_of_record_1 = offset_to_first_record + record_size + 1;
+    bytes[bad_b_of_record_0..bad_b_of_record_0 + 3].copy_from_slice(b"bad");
+    bytes[bad_a_of_record_1..bad_a_of_record_1 + 3].copy_from_slice(b"bad");
+
+    let error = Reader::new(Cursor::new(bytes.clone()))
+        .unwrap()
+        .read()
+        .unwrap_err();
+    assert_eq!(error.record_num(), 0);
+    assert_eq!(error.field().as_ref().map(|field| field.name()), Some("b"));
+
+    let error = Reader::new(Cursor::new(bytes))
+        .unwrap()
+        .read_columns()
+        .unwrap_err();
+    assert_eq!(error.record_num(), 0);
+    assert_eq!(error.field().as_ref().map(|field| field.name()), Some("b"));
+}